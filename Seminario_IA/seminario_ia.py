@@ -1,11 +1,47 @@
 import time
 import os
 import heapq
-from dataclasses import dataclass, field
-from typing import Optional, Tuple, List, Dict, Set
+from collections import deque
+from array import array
+from typing import Optional, List, Tuple, Deque, Union
 
-# Define um tipo para o estado (linha, coluna)
-State = Tuple[int, int]
+# numpy é opcional: quando instalado, a leitura do labirinto é vetorizada
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# numba é opcional: quando instalado, os laços de busca rodam compilados.
+# Sem ele, o Maze.solve usa a implementação em Python puro.
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Define um tipo para o estado: índice linha * largura + coluna
+State = int
+
+# Valor "infinito" para custos armazenados em array('i')
+INF = 2**31 - 1
+
+# Ações na ordem em que os vizinhos são gerados; as versões compiladas
+# guardam apenas o índice da ação nesta tupla
+ACTIONS = ("cima", "baixo", "esquerda", "direita")
+
+# Ação inversa de cada movimento, usada para unir as metades da busca bidirecional
+OPPOSITE = {"cima": "baixo", "baixo": "cima", "esquerda": "direita", "direita": "esquerda"}
+
+# Número de bits ligados em cada máscara de adjacência (0 a 15): o grau da célula
+BIT_COUNT = tuple(bin(mask).count("1") for mask in range(16))
+
+# Tabelas para bytes.translate: FREE_TABLE leva parede (1) a 0 e célula livre (0) a 1;
+# LEAF_TABLE leva a 1 as máscaras com no máximo um vizinho livre
+FREE_TABLE = bytes([1]) + bytes(255)
+LEAF_TABLE = bytes(1 if mask < 16 and BIT_COUNT[mask] <= 1 else 0 for mask in range(256))
 
 class Node:
     """
@@ -13,6 +49,9 @@ class Node:
     Armazena o estado atual, o nó pai (para reconstruir o caminho),
     a ação que levou a este estado e os custos associados.
     """
+    # __slots__ dispensa o __dict__ de cada instância: menos memória e acesso mais rápido
+    __slots__ = ("state", "parent", "action", "cost", "heuristic", "total_cost")
+
     def __init__(self, state: State, parent: Optional["Node"], action: Optional[str],
                  cost: int = 0, heuristic: int = 0):
         self.state = state
@@ -22,32 +61,23 @@ class Node:
         self.heuristic = heuristic # h(n): Estimativa do custo daqui até o objetivo
         self.total_cost = cost + heuristic # f(n) = g(n) + h(n)
 
-@dataclass(order=True)
-class PrioritizedItem:
-    """
-    Classe auxiliar para armazenar itens na fila de prioridade (Heap).
-    O 'priority' é usado para ordenar os itens (menor prioridade sai primeiro).
-    O 'counter' serve para desempatar itens com a mesma prioridade.
-    """
-    priority: int
-    counter: int
-    node: Node = field(compare=False)
-
 class StackFrontier:
     """
     Implementa uma fronteira baseada em PILHA (LIFO - Last In, First Out).
     Utilizada pelo algoritmo DFS (Busca em Profundidade).
+    Guarda estados (índices linha * largura + coluna); pai e ação ficam
+    nos vetores parent/action da busca.
     """
     def __init__(self):
-        self.frontier: List[Node] = []
+        self.frontier: List[State] = []
 
-    def add(self, node: Node):
-        self.frontier.append(node)
+    def add(self, state: State):
+        self.frontier.append(state)
 
     def empty(self) -> bool:
         return len(self.frontier) == 0
 
-    def remove(self) -> Node:
+    def remove(self) -> State:
         if self.empty():
             raise Exception("fronteira vazia")
         # Remove o último elemento adicionado (topo da pilha)
@@ -56,247 +86,878 @@ class StackFrontier:
 class QueueFrontier(StackFrontier):
     """
     Implementa uma fronteira baseada em FILA (FIFO - First In, First Out).
-    Utilizada pelo algoritmo BFS (Busca em Largura).
+    Utilizada pelo algoritmo BFS (Busca em Largura). Guarda estados, como a StackFrontier.
     """
-    def remove(self) -> Node:
+    def __init__(self):
+        # deque permite remover do início em O(1), ao contrário de list.pop(0)
+        self.frontier: Deque[State] = deque()
+
+    def add(self, state: State):
+        self.frontier.append(state)
+
+    def empty(self) -> bool:
+        return not self.frontier
+
+    def remove(self) -> State:
         if self.empty():
             raise Exception("fronteira vazia")
-        # Remove o primeiro elemento da lista (início da fila)
-        return self.frontier.pop(0)
+        # Remove o primeiro elemento da fila (início da fila)
+        return self.frontier.popleft()
+
+# Itens da PriorityFrontier: pares (estado, versão) no UCS e no A* (ver Maze._search)
+# ou nós completos na busca bidirecional, que precisa do g e do pai de cada lado
+FrontierItem = Union[Tuple[State, int], Node]
 
 class PriorityFrontier:
     """
     Implementa uma fronteira de prioridade usando uma HEAP (Min-Heap).
-    Utilizada pelos algoritmos A* e Busca de Custo Uniforme (UCS)
+    Utilizada pelos algoritmos A* e Busca de Custo Uniforme (UCS), com itens
+    (estado, versão), e pelo A* bidirecional, com objetos Node.
+    As entradas são tuplas (prioridade, contador, item): o contador desempata
+    itens com a mesma prioridade, então o item nunca é comparado.
     """
     def __init__(self):
-        self.heap: List[PrioritizedItem] = []
+        self.heap: List[Tuple[int, int, FrontierItem]] = []
         self.counter = 0
 
-    def add(self, node: Node, priority: int):
+    def add(self, item: FrontierItem, priority: int):
         self.counter += 1
-        # Adiciona o nó na heap mantendo a ordem de prioridade
-        heapq.heappush(self.heap, PrioritizedItem(priority, self.counter, node))
+        # Adiciona o item na heap mantendo a ordem de prioridade
+        heapq.heappush(self.heap, (priority, self.counter, item))
 
     def empty(self) -> bool:
         return len(self.heap) == 0
 
-    def remove(self) -> Node:
+    def remove(self) -> FrontierItem:
         if self.empty():
             raise Exception("fronteira vazia")
-        # Retorna o nó com a menor prioridade (menor custo)
-        return heapq.heappop(self.heap).node
+        # Retorna o item com a menor prioridade (menor custo)
+        return heapq.heappop(self.heap)[2]
+
+# ---------------- BUSCAS COMPILADAS (NUMBA) ----------------
+# Cada função de busca recebe a máscara de adjacência e o vetor de explorados
+# como arrays planos (índice linha * largura + coluna) e devolve os vetores parent/action,
+# o número de nós explorados e se o objetivo foi encontrado.
+
+@njit(cache=True)
+def _neighbor(i, r, c, k, H, W):
+    """Índice do vizinho de i na direção ACTIONS[k], ou -1 se sair do labirinto."""
+    if k == 0:
+        return i - W if r > 0 else -1
+    if k == 1:
+        return i + W if r < H - 1 else -1
+    if k == 2:
+        return i - 1 if c > 0 else -1
+    return i + 1 if c < W - 1 else -1
+
+@njit(cache=True)
+def _step(i, k, W):
+    """Índice do vizinho de i na direção ACTIONS[k], sem checar limites (ver Maze.adj)."""
+    if k == 0:
+        return i - W
+    if k == 1:
+        return i + W
+    if k == 2:
+        return i - 1
+    return i + 1
+
+@njit(cache=True)
+def _solve_dfs(adj, explored, H, W, start_idx, goal_idx):
+    N = H * W
+    parent = np.full(N, -1, np.int64)
+    action = np.full(N, -1, np.int8)
+
+    # Pilha de estados; cada expansão empilha no máximo 4 filhos. Pai e ação são
+    # gravados ao empilhar: a entrada mais nova de um estado é a primeira a sair
+    stack = np.empty(4 * N + 1, np.int64)
+    stack[0] = start_idx
+    top = 1
+    num_explored = 0
+
+    # Estado a expandir sem passar pela pilha (passo seguinte em um corredor)
+    i = -1
+
+    while True:
+        if i < 0:
+            if top == 0:
+                return parent, action, num_explored, False
+            top -= 1
+            i = stack[top]
+        num_explored += 1
+
+        if i == goal_idx:
+            return parent, action, num_explored, True
+
+        if explored[i]:
+            i = -1
+            continue
+        explored[i] = 1
+
+        # Corredor: com um único filho, ele seria o próximo a sair da pilha,
+        # então seguimos direto por ele. Só bifurcações vão para a pilha
+        mask = adj[i]
+        only = -1
+        children = 0
+        for k in range(4):
+            if not mask & (1 << k):
+                continue
+            n = _step(i, k, W)
+            if not explored[n]:
+                parent[n] = i
+                action[n] = k
+                stack[top + children] = n
+                children += 1
+                only = n
+
+        if children == 1:
+            i = only
+        else:
+            top += children
+            i = -1
+
+@njit(cache=True)
+def _solve_bfs(adj, explored, H, W, start_idx, goal_idx):
+    N = H * W
+    parent = np.full(N, -1, np.int64)
+    action = np.full(N, -1, np.int8)
+    seen = np.zeros(N, np.uint8)
+
+    # Fila em um array pré-alocado; cada estado entra na fila uma única vez
+    queue = np.empty(N, np.int64)
+    queue[0] = start_idx
+    seen[start_idx] = 1
+    head = 0
+    tail = 1
+    num_explored = 0
+
+    while head < tail:
+        i = queue[head]
+        head += 1
+        num_explored += 1
+
+        if i == goal_idx:
+            return parent, action, num_explored, True
+
+        if explored[i]:
+            continue
+        explored[i] = 1
+
+        mask = adj[i]
+        for k in range(4):
+            if not mask & (1 << k):
+                continue
+            n = _step(i, k, W)
+            if not seen[n]:
+                seen[n] = 1
+                parent[n] = i
+                action[n] = k
+                queue[tail] = n
+                tail += 1
+
+    return parent, action, num_explored, False
+
+@njit(cache=True)
+def _solve_astar(adj, explored, H, W, start_idx, goal_idx, use_heuristic):
+    """A* com distância de Manhattan; com use_heuristic=False vira Custo Mínimo (UCS)."""
+    N = H * W
+    parent = np.full(N, -1, np.int64)
+    action = np.full(N, -1, np.int8)
+    best_g = np.full(N, INF, np.int64)
+    # Versão de cada estado, incrementada a cada relaxamento (ver Maze._search)
+    version = np.zeros(N, np.int64)
+    gr = goal_idx // W
+    gc = goal_idx - gr * W
+
+    best_g[start_idx] = 0
+    h = 0
+    if use_heuristic:
+        r = start_idx // W
+        c = start_idx - r * W
+        h = abs(r - gr) + abs(c - gc)
+
+    # Entradas da heap: (f, contador de desempate, versão, estado)
+    counter = 1
+    heap = [(h, counter, 0, start_idx)]
+    num_explored = 0
+
+    while len(heap) > 0:
+        f, _, v, i = heapq.heappop(heap)
+        num_explored += 1
+
+        # Entrada antiga: o estado foi relaxado de novo depois dela
+        if v != version[i]:
+            continue
+
+        if i == goal_idx:
+            return parent, action, num_explored, True
+
+        explored[i] = 1
+
+        mask = adj[i]
+        new_g = best_g[i] + 1
+        for k in range(4):
+            if not mask & (1 << k):
+                continue
+            n = _step(i, k, W)
+            if new_g < best_g[n]:
+                best_g[n] = new_g
+                parent[n] = i
+                action[n] = k
+                version[n] += 1
+                h = 0
+                if use_heuristic:
+                    nr = n // W
+                    nc = n - nr * W
+                    h = abs(nr - gr) + abs(nc - gc)
+                counter += 1
+                heapq.heappush(heap, (new_g + h, counter, version[n], n))
+
+    return parent, action, num_explored, False
+
+@njit(cache=True)
+def _fill_dead_ends(walls, degree, H, W, start_idx, goal_idx):
+    """
+    Preenche becos sem saída: células abertas com no máximo um vizinho aberto
+    (exceto início e fim) viram parede, repetidamente, até não restar nenhuma.
+    Altera walls no lugar (degree é um vetor auxiliar de H * W zeros) e devolve
+    quantas células foram preenchidas. O(H * W).
+    """
+    N = H * W
+    # Pilha de células candidatas (criada com um elemento para o numba inferir o tipo)
+    stack = [start_idx]
+    stack.pop()
+
+    # Grau inicial de cada célula aberta
+    for i in range(N):
+        if walls[i]:
+            continue
+        r = i // W
+        c = i - r * W
+        d = 0
+        for k in range(4):
+            n = _neighbor(i, r, c, k, H, W)
+            if n >= 0 and not walls[n]:
+                d += 1
+        degree[i] = d
+        if d <= 1 and i != start_idx and i != goal_idx:
+            stack.append(i)
+
+    filled = 0
+    while len(stack) > 0:
+        i = stack.pop()
+        if walls[i]:
+            continue
+        walls[i] = 1
+        filled += 1
+
+        # O vizinho que sobrou perde um grau e pode virar um novo beco
+        r = i // W
+        c = i - r * W
+        for k in range(4):
+            n = _neighbor(i, r, c, k, H, W)
+            if n >= 0 and not walls[n]:
+                degree[n] -= 1
+                if degree[n] <= 1 and n != start_idx and n != goal_idx:
+                    stack.append(n)
+
+    return filled
+
+@njit(cache=True)
+def _build_adjacency(walls, adj, H, W):
+    """
+    Preenche adj com a máscara de vizinhos abertos de cada célula: o bit k
+    fica ligado quando a ação ACTIONS[k] leva a uma célula aberta dentro do mapa.
+    """
+    for i in range(H * W):
+        if walls[i]:
+            continue
+        r = i // W
+        c = i - r * W
+        mask = 0
+        for k in range(4):
+            n = _neighbor(i, r, c, k, H, W)
+            if n >= 0 and not walls[n]:
+                mask |= 1 << k
+        adj[i] = mask
+
+# Indica se os kernels de busca já foram compilados (ou carregados do cache) neste processo
+_kernels_ready = False
+
+def _prepare_kernels():
+    """
+    Compila (ou carrega do cache em disco) os kernels de busca uma única vez,
+    resolvendo um mapa de 1 x 2 células com cada um deles, para que o tempo
+    medido em Maze.solve inclua apenas a busca.
+    """
+    global _kernels_ready
+    if _kernels_ready:
+        return
+    # Mesmos tipos usados em Maze.solve: visões uint8 e inteiros do Python
+    adj = np.array([8, 4], dtype=np.uint8)
+    _solve_dfs(adj, np.zeros(2, dtype=np.uint8), 1, 2, 0, 1)
+    _solve_bfs(adj, np.zeros(2, dtype=np.uint8), 1, 2, 0, 1)
+    _solve_astar(adj, np.zeros(2, dtype=np.uint8), 1, 2, 0, 1, True)
+    _kernels_ready = True
 
 class Maze:
     """
     Classe principal que representa o labirinto.
     Responsável por ler o arquivo, encontrar vizinhos e executar os algoritmos de busca.
     """
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, prune_dead_ends: bool = True):
         # Lê o arquivo do labirinto
-        with open(filename, "r", encoding="utf-8") as f:
-            raw = f.read()
+        with open(filename, "rb") as f:
+            raw = f.read().decode("utf-8")
+
+        # Paredes armazenadas em um único bytearray (1 = parede), indexado por
+        # linha * largura + coluna, para acesso rápido e contíguo na memória.
+        # A versão numpy conta um byte por coluna, então só é usada com texto ASCII
+        if np is not None and raw.isascii():
+            self._parse_numpy(raw)
+        else:
+            self._parse(raw)
 
-        # Validação do arquivo
-        if raw.count("A") != 1:
-            raise Exception("o labirinto deve ter exatamente um ponto de partida")
-        if raw.count("B") != 1:
-            raise Exception("o labirinto deve ter exatamente um objetivo")
+        # Índices (linha * largura + coluna) usados como estado durante a busca
+        self.start_idx = self.start[0] * self.width + self.start[1]
+        self.goal_idx = self.goal[0] * self.width + self.goal[1]
+
+        # Paredes usadas pelas buscas; self.walls guarda o mapa original para o desenho
+        self.search_walls = bytearray(self.walls)
 
+        # Máscara de adjacência por célula (bit k = ACTIONS[k] está livre), calculada
+        # uma vez para que as buscas não testem limites e paredes a cada expansão
+        self._build_adjacency()
+        if prune_dead_ends:
+            self._prune_dead_ends()
+
+        self.solution = None
+        # Células exploradas marcadas em um bytearray indexado como self.walls
+        self.explored = bytearray(self.height * self.width)
+        self.num_explored = 0
+
+    def _parse(self, raw: str):
+        """
+        Leitura em Python puro: identifica paredes, início e fim caractere a caractere.
+        """
         lines = raw.splitlines()
+        # Arquivo vazio: não há ponto de partida (e max() não teria linhas para medir)
+        if not lines:
+            raise Exception("o labirinto deve ter exatamente um ponto de partida")
         self.height = len(lines)
         self.width = max(len(line) for line in lines)
 
-        self.walls: List[List[bool]] = []
-        self.cells: List[List[str]] = []
+        self.walls = bytearray(self.height * self.width)
 
-        # Processa o mapa identificando paredes, início e fim
+        # Processa o mapa identificando paredes, início e fim.
+        # Os pontos de partida e objetivos são contados na mesma passada
+        a_count = 0
+        b_count = 0
         for i in range(self.height):
-            wall_row = []
-            cell_row = []
+            line = lines[i]
             for j in range(self.width):
                 try:
-                    ch = lines[i][j]
+                    ch = line[j]
                 except IndexError:
                     ch = "#"
 
-                cell_row.append(ch)
                 if ch == "A":
                     self.start = (i, j)
-                    wall_row.append(False)
+                    a_count += 1
                 elif ch == "B":
                     self.goal = (i, j)
-                    wall_row.append(False)
-                elif ch == " ":
-                    wall_row.append(False)
-                else:
-                    wall_row.append(True)
-            self.walls.append(wall_row)
-            self.cells.append(cell_row)
+                    b_count += 1
+                elif ch != " ":
+                    self.walls[i * self.width + j] = 1
 
-        self.solution = None
-        self.explored: Set[State] = set()
-        self.num_explored = 0
+        # Validação do arquivo
+        if a_count != 1:
+            raise Exception("o labirinto deve ter exatamente um ponto de partida")
+        if b_count != 1:
+            raise Exception("o labirinto deve ter exatamente um objetivo")
+
+    def _parse_numpy(self, raw: str):
+        """
+        Leitura vetorizada com numpy (apenas texto ASCII): as linhas são completadas
+        com parede até a largura máxima e o mapa inteiro é classificado com
+        comparações sobre o array. As linhas são separadas com str.splitlines,
+        como em _parse, para que as duas leituras vejam o mesmo labirinto.
+        """
+        lines = raw.splitlines()
+        # Arquivo vazio: não há ponto de partida (e max() não teria linhas para medir)
+        if not lines:
+            raise Exception("o labirinto deve ter exatamente um ponto de partida")
+        self.height = len(lines)
+        self.width = max(len(line) for line in lines)
+
+        grid = np.frombuffer("".join(line.ljust(self.width, "#") for line in lines).encode("ascii"),
+                             dtype=np.uint8)
+
+        # Validação do arquivo
+        starts = np.flatnonzero(grid == ord("A"))
+        if len(starts) != 1:
+            raise Exception("o labirinto deve ter exatamente um ponto de partida")
+        goals = np.flatnonzero(grid == ord("B"))
+        if len(goals) != 1:
+            raise Exception("o labirinto deve ter exatamente um objetivo")
+
+        self.start = divmod(int(starts[0]), self.width)
+        self.goal = divmod(int(goals[0]), self.width)
+
+        walls = (grid != ord(" ")) & (grid != ord("A")) & (grid != ord("B"))
+        self.walls = bytearray(walls.view(np.uint8))
+
+    def _build_adjacency(self):
+        """
+        Calcula self.adj a partir de self.search_walls. Com numba usa o kernel
+        compilado; sem ele, trata o mapa inteiro como um inteiro grande com um byte
+        por célula (1 = livre) e compara o mapa com cópias deslocadas de uma célula
+        (8 bits) ou de uma linha (8 * largura bits), uma por direção.
+        """
+        H, W = self.height, self.width
+        N = H * W
+        if HAS_NUMBA:
+            self.adj = bytearray(N)
+            _build_adjacency(np.frombuffer(self.search_walls, dtype=np.uint8),
+                             np.frombuffer(self.adj, dtype=np.uint8), H, W)
+            return
+
+        free = int.from_bytes(self.search_walls.translate(FREE_TABLE), "little")
+        # Colunas que têm vizinho à esquerda (todas menos a primeira) e à direita (menos a última)
+        has_left = int.from_bytes((b"\x00" + b"\x01" * (W - 1)) * H, "little")
+        has_right = int.from_bytes((b"\x01" * (W - 1) + b"\x00") * H, "little")
+
+        # Cada byte vale 1 quando a célula e o vizinho naquela direção estão livres
+        up = free & (free << 8 * W)
+        down = free & (free >> 8 * W)
+        left = free & (free << 8) & has_left
+        right = free & (free >> 8) & has_right
+
+        # Os valores por byte não passam de 15, então as direções não se misturam
+        self.adj = bytearray((up | down << 1 | left << 2 | right << 3).to_bytes(N, "little"))
+
+    def _prune_dead_ends(self):
+        """
+        Pré-processamento: preenche os becos sem saída em self.search_walls,
+        para que nenhuma busca chegue a considerá-los, e atualiza self.adj.
+        """
+        N = self.height * self.width
+        if HAS_NUMBA:
+            _fill_dead_ends(np.frombuffer(self.search_walls, dtype=np.uint8),
+                            np.zeros(N, dtype=np.uint8),
+                            self.height, self.width, self.start_idx, self.goal_idx)
+            self._build_adjacency()
+            return
+
+        # Sem numba: o grau de cada célula é o número de bits da sua máscara em self.adj.
+        # Ao preencher uma célula, o bit que aponta para ela é apagado no vizinho,
+        # então a máscara (e o grau) ficam corretos sem recalcular o mapa
+        walls = self.search_walls
+        adj = self.adj
+        W = self.width
+        s, g = self.start_idx, self.goal_idx
+        # Vizinhos como (bit em adj, bit do vizinho que aponta de volta, deslocamento do índice)
+        steps = ((1, 2, -W), (2, 1, W), (4, 8, -1), (8, 4, 1))
+
+        # Candidatas iniciais: células livres com no máximo um vizinho livre. As duas
+        # condições viram bytes 0/1 e são combinadas com um AND entre inteiros grandes
+        free = int.from_bytes(walls.translate(FREE_TABLE), "little")
+        leaves = (int.from_bytes(adj.translate(LEAF_TABLE), "little") & free).to_bytes(N, "little")
+        stack = []
+        i = leaves.find(1)
+        while i >= 0:
+            stack.append(i)
+            i = leaves.find(1, i + 1)
+
+        while stack:
+            i = stack.pop()
+            if walls[i] or i == s or i == g:
+                continue
+            walls[i] = 1
+            mask = adj[i]
+            adj[i] = 0
+            for bit, back, offset in steps:
+                if mask & bit:
+                    n = i + offset
+                    adj[n] ^= back
+                    if BIT_COUNT[adj[n]] <= 1:
+                        stack.append(n)
 
     def neighbors(self, state: State):
         """
         Retorna os vizinhos válidos (cima, baixo, esquerda, direita)
         que não são paredes e estão dentro dos limites do labirinto.
         """
-        row, col = state
+        w = self.width
+        mask = self.adj[state]
         candidates = [
-            ("cima", (row - 1, col)),
-            ("baixo", (row + 1, col)),
-            ("esquerda", (row, col - 1)),
-            ("direita", (row, col + 1)),
+            ("cima", state - w),
+            ("baixo", state + w),
+            ("esquerda", state - 1),
+            ("direita", state + 1),
         ]
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
+        return [candidates[k] for k in range(4) if mask & (1 << k)]
 
     def manhattan_distance(self, state: State) -> int:
         """
         Função Heurística: Distância de Manhattan.
         Calcula a distância absoluta (linhas + colunas) até o objetivo.
         """
-        r, c = state
+        r, c = divmod(state, self.width)
         gr, gc = self.goal
         return abs(r - gr) + abs(c - gc)
 
     def reconstruct_path(self, node: Node):
         """
         Reconstrói o caminho do objetivo até o início seguindo os nós pais.
+        As células da solução são convertidas de volta para (linha, coluna).
         """
         actions = []
         cells = []
         while node.parent is not None:
             actions.append(node.action)
-            cells.append(node.state)
+            cells.append(divmod(node.state, self.width))
             node = node.parent
         actions.reverse()
         cells.reverse()
         self.solution = (actions, cells)
 
+    def _reconstruct_from_arrays(self, parent, action):
+        """
+        Reconstrói o caminho a partir dos vetores parent/action, seguindo
+        os pais desde o objetivo até o início (pai -1).
+        """
+        actions = []
+        cells = []
+        state = self.goal_idx
+        while parent[state] != -1:
+            actions.append(ACTIONS[action[state]])
+            cells.append(divmod(state, self.width))
+            state = int(parent[state])
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+
     def solve(self, algorithm: str = "BFS"):
 
         #Executa o algoritmo de busca escolhido para resolver o labirinto.
 
         print(f"Resolvendo com algoritmo: {algorithm}...")
+
+        # A compilação do numba fica fora do tempo medido
+        if HAS_NUMBA:
+            _prepare_kernels()
         start_time = time.time()
 
         self.num_explored = 0
-        self.explored = set()
+        self.explored = bytearray(self.height * self.width)
         self.solution = None
 
-        # Dicionário para armazenar o melhor custo g(n) encontrado para cada estado
-        # Isso evita reexplorar caminhos mais caros
-        best_g: Dict[State, int] = {self.start: 0}
+        if algorithm not in ("DFS", "BFS", "CustoMinimo", "A*"):
+            raise Exception("Algoritmo desconhecido")
 
-        # Configura o nó inicial
-        start_h = self.manhattan_distance(self.start) if algorithm == "A*" else 0
-        start_node = Node(self.start, None, None, cost=0, heuristic=start_h)
+        # --- VERSÃO COMPILADA (quando o numba está disponível) ---
+        if HAS_NUMBA:
+            # Visões numpy sobre os bytearrays, sem cópia
+            args = (np.frombuffer(self.adj, dtype=np.uint8),
+                    np.frombuffer(self.explored, dtype=np.uint8),
+                    self.height, self.width, self.start_idx, self.goal_idx)
+            if algorithm == "DFS":
+                parent, action, num_explored, found = _solve_dfs(*args)
+            elif algorithm == "BFS":
+                parent, action, num_explored, found = _solve_bfs(*args)
+            else:
+                parent, action, num_explored, found = _solve_astar(*args, algorithm == "A*")
+
+            self.num_explored = num_explored
+            if not found:
+                raise Exception("sem solução")
 
         # --- LÓGICA DO DFS (Busca em Profundidade) ---
-        if algorithm == "DFS":
+        elif algorithm == "DFS":
             frontier = StackFrontier()
-            frontier.add(start_node)
-
-            while True:
-                if frontier.empty():
-                    raise Exception("sem solução")
-
-                node = frontier.remove()
-                self.num_explored += 1
-
-                if node.state == self.goal:
-                    end_time = time.time()
-                    self.reconstruct_path(node)
-                    self._print_results(end_time - start_time)
-                    return
-
-                # No DFS simples, apenas evitamos ciclos checando o explored
-                if node.state in self.explored:
-                    continue
-                self.explored.add(node.state)
-
-                for action, state in self.neighbors(node.state):
-                    if state not in self.explored:
-                        child = Node(state, node, action, cost=node.cost + 1)
-                        frontier.add(child)
+            frontier.add(self.start_idx)
+            parent, action = self._search(frontier, depth_first=True)
 
         # --- LÓGICA DO BFS (Busca em Largura) ---
         elif algorithm == "BFS":
             frontier = QueueFrontier()
-            frontier.add(start_node)
+            frontier.add(self.start_idx)
+            parent, action = self._search(frontier)
 
-            while True:
-                if frontier.empty():
-                    raise Exception("sem solução")
+        # --- LÓGICA PARA A* E CUSTO MÍNIMO (UCS) ---
+        else:
+            # UCS usa apenas o custo g(n) como prioridade
+            # A* usa f(n) = g(n) + h(n), com a distância de Manhattan em linha
+            use_heuristic = algorithm == "A*"
+            frontier = PriorityFrontier()
+            start_h = self.manhattan_distance(self.start_idx) if use_heuristic else 0
+            # Entradas da heap são (estado, versão); o estado inicial começa na versão 0
+            frontier.add((self.start_idx, 0), start_h)
+            parent, action = self._search(frontier, prioritized=True, use_heuristic=use_heuristic)
 
-                node = frontier.remove()
-                self.num_explored += 1
+        end_time = time.time()
+        self._reconstruct_from_arrays(parent, action)
+        self._print_results(end_time - start_time)
 
-                if node.state == self.goal:
-                    end_time = time.time()
-                    self.reconstruct_path(node)
-                    self._print_results(end_time - start_time)
-                    return
+    def _search(self, frontier, depth_first: bool = False, prioritized: bool = False,
+                use_heuristic: bool = False):
+        """
+        Núcleo comum das buscas em Python puro (DFS, BFS, UCS e A*): remoção da
+        fronteira, descarte de entradas antigas, teste de objetivo e um único laço
+        sobre os movimentos livres. Só a regra de aceitação e a inserção mudam.
+        A fronteira já deve conter o estado inicial. Com depth_first (DFS), todo
+        filho não explorado é empilhado e corredores são percorridos direto.
+        Com prioritized (UCS e A*), a fronteira é uma PriorityFrontier de pares
+        (estado, versão) e um filho só entra nela quando melhora o seu custo g(n);
+        use_heuristic soma a distância de Manhattan à prioridade (A*).
+        Sem nenhuma das duas opções (BFS), cada estado entra na fila uma única vez.
+        Devolve os vetores parent/action ou lança "sem solução".
+        """
+        N = self.height * self.width
+
+        # Variáveis locais evitam buscas de atributo a cada expansão
+        adj = self.adj
+        goal = self.goal_idx
+        explored = self.explored
+        push = frontier.add
+        pop = frontier.remove
+        empty = frontier.empty
+        take_last = frontier.frontier.pop if depth_first else None
+        W = self.width
+        gr, gc = self.goal
 
-                if node.state in self.explored:
-                    continue
-                self.explored.add(node.state)
+        # Vetores indexados pelo estado: pai no caminho e índice da ação em ACTIONS.
+        # Pai e ação são gravados ao inserir na fronteira. No DFS um estado pode ser
+        # empilhado de novo, mas a entrada mais nova sai primeiro, então sobrescrever é correto
+        parent = array('i', [-1]) * N
+        action = bytearray(N)
 
-                for action, state in self.neighbors(node.state):
-                    # No BFS, se já visitamos ou já colocamos na fronteira com menor custo, ignoramos
-                    if state not in best_g:
-                        best_g[state] = node.cost + 1
-                        child = Node(state, node, action, cost=node.cost + 1)
-                        frontier.add(child)
+        # Array com o melhor custo g(n) encontrado para cada estado (índice linha * largura + coluna)
+        # Isso evita reexplorar caminhos mais caros; INF marca estados ainda não alcançados
+        best_g = array('i', [INF]) * N
+        best_g[self.start_idx] = 0
 
-        # --- LÓGICA PARA A* E CUSTO MÍNIMO (UCS) ---
-        elif algorithm in ("CustoMinimo", "A*"):
-            frontier = PriorityFrontier()
+        # Versão de cada estado (UCS e A*): incrementada a cada relaxamento e gravada na
+        # entrada da heap. Entradas com versão antiga são descartadas na remoção
+        version = array('i', [0]) * N if prioritized else None
 
-            # Define a função de prioridade baseada no algoritmo
-            def priority(n: Node):
-                # UCS usa apenas o custo g(n)
-                # A* usa f(n) = g(n) + h(n)
-                return n.cost if algorithm == "CustoMinimo" else n.cost + n.heuristic
+        # Vizinhos possíveis de cada máscara de adjacência (0 a 15), na ordem de ACTIONS,
+        # como (deslocamento do índice, índice da ação): os quatro movimentos são
+        # enumerados uma única vez, e só os livres são visitados
+        steps = ((1, -W, 0), (2, W, 1), (4, -1, 2), (8, 1, 3))
+        moves = [tuple((offset, k) for bit, offset, k in steps if mask & bit)
+                 for mask in range(16)]
 
-            frontier.add(start_node, priority(start_node))
+        # h(n) de cada filho, na ordem de ACTIONS; no UCS fica sempre zero
+        child_h = (0, 0, 0, 0)
 
-            while True:
-                if frontier.empty():
-                    raise Exception("sem solução")
+        # Contador local, gravado em self.num_explored uma única vez no final
+        num_explored = 0
 
-                node = frontier.remove()
-                self.num_explored += 1
+        # Estado a expandir sem passar pela fronteira (passo seguinte em um corredor do DFS)
+        i = -1
 
-                # Se já encontramos um caminho mais barato para este estado antes, ignoramos este
-                if node.cost > best_g.get(node.state, float("inf")):
-                    continue
+        try:
+            while True:
+                if i < 0:
+                    if empty():
+                        raise Exception("sem solução")
+                    if prioritized:
+                        i, v = pop()
+                        num_explored += 1
+                        # Entrada antiga: o estado foi relaxado de novo depois dela
+                        if v != version[i]:
+                            i = -1
+                            continue
+                    else:
+                        i = pop()
+                        num_explored += 1
+                        # Entrada antiga: o estado já foi expandido
+                        if explored[i]:
+                            i = -1
+                            continue
+                else:
+                    num_explored += 1
+
+                if i == goal:
+                    return parent, action
+
+                explored[i] = 1
+                g = best_g[i] + 1
+
+                if use_heuristic:
+                    # Distância de Manhattan em linha: cada movimento muda uma única
+                    # coordenada, então o h do filho é o h atual mais ou menos 1
+                    r, c = divmod(i, W)
+                    h = (gr - r if r < gr else r - gr) + (gc - c if c < gc else c - gc)
+                    child_h = (h - 1 if r > gr else h + 1, h - 1 if r < gr else h + 1,
+                               h - 1 if c > gc else h + 1, h - 1 if c < gc else h + 1)
+
+                children = 0
+                for offset, k in moves[adj[i]]:
+                    n = i + offset
+
+                    # Regra de aceitação: no DFS, todo filho não explorado; nas demais,
+                    # só quando o custo g(n) melhora (relaxamento da aresta). No BFS o
+                    # primeiro caminho que alcança um estado já é o mais curto
+                    if depth_first:
+                        if explored[n]:
+                            continue
+                    elif g < best_g[n]:
+                        best_g[n] = g
+                    else:
+                        continue
+
+                    parent[n] = i
+                    action[n] = k
+                    if prioritized:
+                        version[n] += 1
+                        push((n, version[n]), g + child_h[k])
+                    else:
+                        push(n)
+                    children += 1
+
+                # Corredor no DFS: com um único filho, ele é o próximo a sair da pilha,
+                # então seguimos direto por ele (a pilha não está vazia, pois o filho
+                # acabou de ser empilhado, e o teste de vazio pode ser pulado)
+                if depth_first and children == 1:
+                    i = take_last()
+                else:
+                    i = -1
+        finally:
+            self.num_explored = num_explored
 
-                if node.state == self.goal:
-                    end_time = time.time()
-                    self.reconstruct_path(node)
-                    self._print_results(end_time - start_time)
-                    return
+    def solve_bidirectional(self):
+        """
+        A* bidirecional (MM): uma busca parte do início (heurística até o objetivo)
+        e outra parte do objetivo (heurística até o início), expandindo sempre
+        a fronteira menor. A prioridade de cada nó é max(f(n), 2 * g(n)), o que faz
+        as duas buscas se encontrarem perto do meio do caminho. Quando um estado é
+        alcançado pelas duas buscas, o custo mu = g_frente + g_trás do encontro é
+        registrado. A busca termina quando mu não passa do limite inferior
+        max(menor prioridade das duas fronteiras, menores g abertos somados + 1),
+        e as duas metades do caminho são unidas.
+        """
+        print("Resolvendo com algoritmo: A* Bidirecional...")
+        start_time = time.time()
 
-                self.explored.add(node.state)
+        self.num_explored = 0
+        self.explored = bytearray(self.height * self.width)
+        self.solution = None
 
-                for action, state in self.neighbors(node.state):
-                    new_g = node.cost + 1
-                    # Relaxamento da aresta: se encontramos um caminho melhor, atualizamos
-                    if new_g < best_g.get(state, float("inf")):
-                        best_g[state] = new_g
-                        new_h = self.manhattan_distance(state) if algorithm == "A*" else 0
-                        child = Node(state, node, action, cost=new_g, heuristic=new_h)
-                        frontier.add(child, priority(child))
+        N = self.height * self.width
+        W = self.width
+        explored = self.explored
+        sr, sc = self.start
+        gr, gc = self.goal
 
-        else:
-            raise Exception("Algoritmo desconhecido")
+        def h_fwd(state: State) -> int:
+            r, c = divmod(state, W)
+            return abs(r - gr) + abs(c - gc)
+
+        def h_bwd(state: State) -> int:
+            r, c = divmod(state, W)
+            return abs(r - sr) + abs(c - sc)
+
+        # Estruturas de cada direção: fronteira, melhor custo g(n) e melhor nó por estado
+        fwd = PriorityFrontier()
+        bwd = PriorityFrontier()
+        g_fwd = array('i', [INF]) * N
+        g_bwd = array('i', [INF]) * N
+        nodes_fwd: List[Optional[Node]] = [None] * N
+        nodes_bwd: List[Optional[Node]] = [None] * N
+
+        # Quantidade de estados abertos (na fronteira, ainda não expandidos) por valor
+        # de g em cada direção, e o menor g aberto. Com custo unitário os filhos têm
+        # g maior que o do nó expandido, então o menor g aberto nunca diminui
+        open_fwd = bytearray(N)
+        open_bwd = bytearray(N)
+        count_fwd = array('i', [0]) * N
+        count_bwd = array('i', [0]) * N
+        count_fwd[0] = count_bwd[0] = 1
+        open_fwd[self.start_idx] = open_bwd[self.goal_idx] = 1
+        gmin_fwd = gmin_bwd = 0
+
+        start_node = Node(self.start_idx, None, None, cost=0, heuristic=h_fwd(self.start_idx))
+        goal_node = Node(self.goal_idx, None, None, cost=0, heuristic=h_bwd(self.goal_idx))
+        g_fwd[self.start_idx] = 0
+        g_bwd[self.goal_idx] = 0
+        nodes_fwd[self.start_idx] = start_node
+        nodes_bwd[self.goal_idx] = goal_node
+        fwd.add(start_node, start_node.total_cost)
+        bwd.add(goal_node, goal_node.total_cost)
+
+        # Melhor custo de caminho completo encontrado e os nós do encontro (frente, trás)
+        mu = INF
+        meet = None
+
+        while not fwd.empty() and not bwd.empty():
+            # Nenhum caminho ainda não encontrado custa menos que a menor prioridade
+            # entre as duas fronteiras, nem que os menores g abertos somados a uma aresta
+            # (só com entradas antigas na heap, o menor g aberto chega a N, acima de qualquer caminho)
+            while gmin_fwd < N and not count_fwd[gmin_fwd]:
+                gmin_fwd += 1
+            while gmin_bwd < N and not count_bwd[gmin_bwd]:
+                gmin_bwd += 1
+            if mu <= max(min(fwd.heap[0][0], bwd.heap[0][0]), gmin_fwd + gmin_bwd + 1):
+                break
+
+            # Expande a fronteira menor
+            if len(fwd.heap) <= len(bwd.heap):
+                frontier, g_this, g_other, nodes_this, nodes_other, h, open_this, count_this = \
+                    fwd, g_fwd, g_bwd, nodes_fwd, nodes_bwd, h_fwd, open_fwd, count_fwd
+                forward = True
+            else:
+                frontier, g_this, g_other, nodes_this, nodes_other, h, open_this, count_this = \
+                    bwd, g_bwd, g_fwd, nodes_bwd, nodes_fwd, h_bwd, open_bwd, count_bwd
+                forward = False
+
+            node = frontier.remove()
+            self.num_explored += 1
+
+            # Entrada antiga: já existe um caminho mais barato para este estado
+            if node.cost > g_this[node.state]:
+                continue
+            explored[node.state] = 1
+            open_this[node.state] = 0
+            count_this[node.cost] -= 1
+
+            new_g = node.cost + 1
+            for action, state in self.neighbors(node.state):
+                if new_g < g_this[state]:
+                    # O estado sai do nível de g antigo (se estava aberto) e entra no novo
+                    if open_this[state]:
+                        count_this[g_this[state]] -= 1
+                    open_this[state] = 1
+                    count_this[new_g] += 1
+                    g_this[state] = new_g
+                    child = Node(state, node, action, cost=new_g, heuristic=h(state))
+                    nodes_this[state] = child
+                    frontier.add(child, max(child.total_cost, 2 * new_g))
+
+                    # Estado já alcançado pela outra direção: candidato a encontro
+                    if g_other[state] != INF and new_g + g_other[state] < mu:
+                        mu = new_g + g_other[state]
+                        other = nodes_other[state]
+                        meet = (child, other) if forward else (other, child)
+
+        if meet is None:
+            raise Exception("sem solução")
+
+        end_time = time.time()
+
+        # Metade da frente: do início até o encontro
+        self.reconstruct_path(meet[0])
+        actions, cells = self.solution
+
+        # Metade de trás: do encontro até o objetivo, invertendo as ações
+        node = meet[1]
+        while node.parent is not None:
+            actions.append(OPPOSITE[node.action])
+            cells.append(divmod(node.parent.state, W))
+            node = node.parent
+
+        self._print_results(end_time - start_time)
 
     def _print_results(self, duration):
         """Método auxiliar para imprimir os resultados."""
@@ -314,6 +975,15 @@ class Maze:
         cell_size = 50
         cell_border = 2
 
+        solution = self.solution[1] if self.solution else None
+
+        if np is not None:
+            img = Image.fromarray(self._render_pixels(solution, show_solution, show_explored,
+                                                      cell_size, cell_border))
+            img.save(filename)
+            print("Imagem salva:", filename)
+            return
+
         img = Image.new(
             "RGBA",
             (self.width * cell_size, self.height * cell_size),
@@ -321,20 +991,20 @@ class Maze:
         )
         draw = ImageDraw.Draw(img)
 
-        solution = self.solution[1] if self.solution else None
-
         for i in range(self.height):
             for j in range(self.width):
 
-                if self.walls[i][j]:
+                if self.walls[i * self.width + j]:
                     fill = (40, 40, 40)    # Paredes
+                elif self.search_walls[i * self.width + j]:
+                    fill = (120, 120, 120) # Becos preenchidos (Cinza)
                 elif (i, j) == self.start:
                     fill = (255, 0, 0)     # Início
                 elif (i, j) == self.goal:
                     fill = (0, 171, 28)    # Fim
                 elif solution and show_solution and (i, j) in solution:
                     fill = (220, 235, 113) # Solução (Amarelo)
-                elif show_explored and (i, j) in self.explored:
+                elif show_explored and self.explored[i * self.width + j]:
                     fill = (212, 97, 85)   # Explorados (Laranja)
                 else:
                     fill = (237, 240, 252) # Vazio
@@ -348,6 +1018,43 @@ class Maze:
         img.save(filename)
         print("Imagem salva:", filename)
 
+    def _render_pixels(self, solution, show_solution, show_explored, cell_size, cell_border):
+        """
+        Versão vetorizada do desenho: classifica cada célula em uma categoria,
+        converte as categorias em cores por uma paleta e amplia o resultado
+        para cell_size x cell_size pixels, apagando as bordas de cada célula.
+        """
+        palette = np.array([
+            (40, 40, 40, 255),    # 0: Paredes
+            (255, 0, 0, 255),     # 1: Início
+            (0, 171, 28, 255),    # 2: Fim
+            (220, 235, 113, 255), # 3: Solução (Amarelo)
+            (212, 97, 85, 255),   # 4: Explorados (Laranja)
+            (237, 240, 252, 255), # 5: Vazio
+            (120, 120, 120, 255), # 6: Becos preenchidos (Cinza)
+        ], dtype=np.uint8)
+
+        # Categorias atribuídas da menor para a maior precedência
+        category = np.full(self.height * self.width, 5, dtype=np.uint8)
+        if show_explored:
+            category[np.frombuffer(self.explored, dtype=np.uint8) != 0] = 4
+        if solution and show_solution:
+            category[[r * self.width + c for r, c in solution]] = 3
+        category[np.frombuffer(self.search_walls, dtype=np.uint8) != 0] = 6
+        category[self.start_idx] = 1
+        category[self.goal_idx] = 2
+        category[np.frombuffer(self.walls, dtype=np.uint8) != 0] = 0
+
+        grid = palette[category.reshape(self.height, self.width)]
+        pixels = np.repeat(np.repeat(grid, cell_size, axis=0), cell_size, axis=1)
+
+        # Mesmo retângulo do ImageDraw: pixels de cell_border até cell_size - cell_border
+        inside = np.zeros(cell_size, dtype=bool)
+        inside[cell_border:cell_size - cell_border + 1] = True
+        pixels[~np.tile(inside, self.height), :] = (0, 0, 0, 255)
+        pixels[:, ~np.tile(inside, self.width)] = (0, 0, 0, 255)
+        return pixels
+
 # ---------------- EXECUÇÃO ----------------
 
 filename = input("Digite o nome do arquivo do labirinto (ex: maze7.txt): ").strip()
@@ -359,11 +1066,14 @@ else:
     try:
         print(f"\n Carregando labirinto: {filename}")
 
+        # O labirinto é lido e pré-processado (becos, adjacência) uma única vez;
+        # cada solve() reinicia explorados e solução antes de buscar
+        m = Maze(filename)
+
         # Teste 1: BFS
         print("\n" + "="*40)
         print(" TESTE 1: BFS (Busca em Largura)")
         print("="*40)
-        m = Maze(filename)
         m.solve("BFS")
         m.output_image(filename.replace(".txt", "_bfs.png"), show_explored=True)
 
@@ -371,7 +1081,6 @@ else:
         print("\n" + "="*40)
         print(" TESTE 2: UCS (Custo Mínimo)")
         print("="*40)
-        m = Maze(filename)
         m.solve("CustoMinimo")
         m.output_image(filename.replace(".txt", "_ucs.png"), show_explored=True)
 
@@ -379,7 +1088,6 @@ else:
         print("\n" + "="*40)
         print(" TESTE 3: A* (A-Star)")
         print("="*40)
-        m = Maze(filename)
         m.solve("A*")
         m.output_image(filename.replace(".txt", "_astar.png"), show_explored=True)
 
@@ -387,10 +1095,16 @@ else:
         print("\n" + "="*40)
         print(" TESTE 4: DFS (Busca em Profundidade)")
         print("="*40)
-        m = Maze(filename)
         m.solve("DFS")
         m.output_image(filename.replace(".txt", "_dfs.png"), show_explored=True)
 
+        # Teste 5: A* Bidirecional
+        print("\n" + "="*40)
+        print(" TESTE 5: A* Bidirecional")
+        print("="*40)
+        m.solve_bidirectional()
+        m.output_image(filename.replace(".txt", "_bidir.png"), show_explored=True)
+
         print("\n Processo finalizado! Verifique as imagens geradas na aba de arquivos.")
 
     except Exception as e: